@@ -8,8 +8,13 @@ ECH Workers 客户端 - 跨平台版本 (Python + PyQt5)
 import sys
 import json
 import os
+import functools
+import mmap
+import selectors
+import shutil
 import subprocess
 import threading
+import uuid
 import ipaddress
 from pathlib import Path
 
@@ -52,10 +57,10 @@ if sys.platform == 'win32':
 # 检查 PyQt5
 try:
     from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                                  QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-                                  QComboBox, QTextEdit, QCheckBox, QGroupBox, 
+                                  QHBoxLayout, QFormLayout, QLabel, QLineEdit, QPushButton, 
+                                  QComboBox, QPlainTextEdit, QCheckBox, QGroupBox, 
                                   QMessageBox, QInputDialog, QSystemTrayIcon, QMenu, QAction)
-    from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
+    from PyQt5.QtCore import Qt, QThread, QTimer, QSignalBlocker, pyqtSignal, QSize
     from PyQt5.QtGui import QIcon, QTextCursor, QPixmap, QPainter, QColor, QFont
     HAS_PYQT = True
     
@@ -106,6 +111,95 @@ def get_app_dir():
         # 开发模式或直接运行 Python 脚本
         return Path(__file__).parent.absolute()
 
+# 程序目录在进程生命周期内不会变化，导入时计算一次
+_APP_DIR = os.fspath(get_app_dir())
+
+# 可执行文件魔数：ELF、Mach-O（大端/64位小端/fat 二进制）、PE、shebang 脚本。
+# startswith 接受元组，一次 C 层调用完成全部前缀匹配
+_EXE_MAGIC = (b'\x7fELF',
+              b'\xfe\xed\xfa', b'\xcf\xfa\xed\xfe', b'\xca\xfe\xba\xbe',
+              b'MZ', b'#!')
+
+
+@functools.lru_cache(maxsize=1)
+def _find_executable(app_dir, cwd):
+    """查找可执行文件（跨平台）
+
+    结果只取决于程序目录和当前工作目录，用 lru_cache 缓存，
+    重复启动时省掉全部文件系统探测。
+    """
+    # Windows 和 Unix 的可执行文件扩展名
+    exe_ext = '.exe' if sys.platform == 'win32' else ''
+
+    # 可能的可执行文件位置（按优先级，目录 + 文件名）
+    candidates = [
+        (app_dir, f'ech-workers{exe_ext}'),
+        (cwd, f'ech-workers{exe_ext}'),
+    ]
+    if sys.platform == 'win32':
+        # Windows 特定路径
+        candidates.append((app_dir, 'ech-workers.exe'))
+        candidates.append((cwd, 'ech-workers.exe'))
+    else:
+        # Unix 路径（无扩展名）
+        candidates.append((app_dir, 'ech-workers'))
+        candidates.append((cwd, 'ech-workers'))
+
+    # 每个目录只做一次 scandir，用文件名集合做成员判断，
+    # 避免对每个候选路径单独 stat() 探测
+    dir_names = {}
+    for dir_path, _ in candidates:
+        if dir_path in dir_names:
+            continue
+        names = set()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_file() or entry.is_symlink():
+                        names.add(entry.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        dir_names[dir_path] = names
+
+    for dir_path, name in candidates:
+        if name not in dir_names[dir_path]:
+            continue
+        path = os.path.join(dir_path, name)
+        # Windows 上 .exe 文件可以直接运行
+        if sys.platform == 'win32' and name.lower().endswith('.exe'):
+            return path
+        # 一次 access(2) 即可确认可执行，不必打开文件看文件头
+        if os.access(path, os.X_OK):
+            return path
+        # 不可执行时才退回读文件头，识别没带执行权限的二进制/脚本
+        try:
+            with open(path, 'rb') as f:
+                try:
+                    # mmap 只换入头部所在的一页，不把整个二进制读进用户态
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        header = m[:4]
+                except (ValueError, OSError):
+                    # 空文件或不支持 mmap 的文件系统，退回普通读取
+                    header = f.read(4)
+        except OSError:
+            continue
+        if header.startswith(_EXE_MAGIC):
+            if sys.platform != 'win32':
+                # 二进制或脚本，尝试补上执行权限
+                try:
+                    os.chmod(path, 0o755)
+                except OSError:
+                    pass
+            return path
+
+    # 尝试从 PATH 中查找
+    exe = shutil.which('ech-workers')
+    if exe:
+        return exe
+
+    # 如果都找不到，返回 None
+    return None
+
 # 复用原有的 ConfigManager, ProcessManager, AutoStartManager
 # 从原文件导入这些类（简化版本）
 class ConfigManager:
@@ -113,54 +207,114 @@ class ConfigManager:
     
     def __init__(self):
         # 跨平台配置文件路径
+        # 启动热路径上用 os.path 拼接，避免 pathlib 的对象构造开销
+        home = os.path.expanduser("~")
         if sys.platform == 'win32':
             # Windows: %APPDATA%\ECHWorkersClient
-            self.config_dir = Path(os.getenv('APPDATA', Path.home())) / "ECHWorkersClient"
+            self.config_dir = os.path.join(os.getenv('APPDATA', home), "ECHWorkersClient")
         else:
             # macOS/Linux: ~/Library/Application Support/ECHWorkersClient 或 ~/.config/ECHWorkersClient
             if sys.platform == 'darwin':
-                self.config_dir = Path.home() / "Library" / "Application Support" / "ECHWorkersClient"
+                self.config_dir = os.path.join(home, "Library", "Application Support", "ECHWorkersClient")
             else:
-                self.config_dir = Path.home() / ".config" / "ECHWorkersClient"
-        
-        self.config_file = self.config_dir / "config.json"
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        self.servers = []
+                self.config_dir = os.path.join(home, ".config", "ECHWorkersClient")
+
+        self.config_file = os.path.join(self.config_dir, "config.json")
+        os.makedirs(self.config_dir, exist_ok=True)
+        # 按 id 索引的服务器表，增删改查都是 O(1)；
+        # dict 保持插入顺序，列表视图由 servers 属性派生
+        self._by_id = {}
+        # 按名称排序的列表缓存，任何增删改都会使其失效
+        self._sorted_cache = None
+        # 上次写盘的序列化内容，用于跳过无变化的重复保存
+        self._last_written_blob = None
+        # 名称索引，用于 O(1) 重名检查
+        self._names = set()
+        # 是否有待保存的修改；save_config 对干净状态直接返回
+        self._dirty = False
         self.current_server_id = None
-        
+
+    @property
+    def servers(self):
+        """服务器列表（按插入顺序）"""
+        return list(self._by_id.values())
+
+    def sorted_servers(self):
+        """服务器列表（按名称排序，惰性计算并缓存）"""
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(self._by_id.values(), key=lambda x: x['name'])
+        return self._sorted_cache
+
     def load_config(self):
         """加载配置"""
-        if self.config_file.exists():
+        if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.servers = data.get('servers', [])
+                # 二进制读入，json 直接解析 UTF-8 字节，
+                # 省掉文本模式先解码成 str 的中间一趟；
+                # 超过一页的配置用 mmap 零拷贝映射、按需换页
+                size = os.path.getsize(self.config_file)
+                with open(self.config_file, 'rb') as f:
+                    if size > 4096:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                            data = json.loads(m[:])
+                    else:
+                        data = json.loads(f.read())
+                    self._by_id = {s['id']: s for s in data.get('servers', [])}
+                    self._names = {s['name'] for s in self._by_id.values()}
+                    self._sorted_cache = None
                     self.current_server_id = data.get('current_server_id')
             except Exception as e:
                 print(f"加载配置失败: {e}")
-                self.servers = []
+                self._by_id = {}
+                self._names = set()
                 self.current_server_id = None
-        
-        if not self.servers:
+
+        if not self._by_id:
             self.add_default_server()
     
+    def mark_dirty(self):
+        """标记配置有待保存的修改"""
+        self._dirty = True
+
     def save_config(self):
-        """保存配置"""
+        """保存配置（无修改或内容未变化时跳过写盘）"""
+        if not self._dirty:
+            return
         try:
             data = {
                 'servers': self.servers,
                 'current_server_id': self.current_server_id
             }
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # 紧凑格式序列化（配置只由程序读写，不需要缩进）
+            blob = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            if blob == self._last_written_blob:
+                self._dirty = False
+                return
+            # 先写临时文件再原子替换，写一半被中断也不会损坏旧配置。
+            # 有意不做 fsync：配置随时可以重新生成，不值得为它付
+            # 刷盘的代价（macOS 上尤其昂贵）；rename 保证了读到的
+            # 文件内容要么全旧要么全新
+            tmp = self.config_file + '.tmp'
+            try:
+                with open(tmp, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp, self.config_file)
+            except OSError:
+                # 清理残留的临时文件再上报错误
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self._last_written_blob = blob
+            self._dirty = False
         except Exception as e:
             print(f"保存配置失败: {e}")
     
     def add_default_server(self):
         """添加默认服务器"""
-        import uuid
         default_server = {
-            'id': str(uuid.uuid4()),
+            'id': uuid.uuid4().hex,
             'name': '默认服务器',
             'server': 'example.com:443',
             'listen': '127.0.0.1:30000',
@@ -170,38 +324,66 @@ class ConfigManager:
             'ech': 'cloudflare-ech.com',
             'routing_mode': 'bypass_cn'  # 默认跳过中国大陆
         }
-        self.servers.append(default_server)
+        self._by_id[default_server['id']] = default_server
+        self._names.add(default_server['name'])
+        self._sorted_cache = None
+        self._dirty = True
         self.current_server_id = default_server['id']
         self.save_config()
-    
+
     def get_current_server(self):
         """获取当前服务器配置"""
-        if self.current_server_id:
-            for server in self.servers:
-                if server['id'] == self.current_server_id:
-                    return server
-        return self.servers[0] if self.servers else None
-    
+        server = self._by_id.get(self.current_server_id)
+        if server is not None:
+            return server
+        return next(iter(self._by_id.values()), None)
+
     def update_server(self, server_data):
         """更新服务器配置"""
-        for i, server in enumerate(self.servers):
-            if server['id'] == server_data['id']:
-                self.servers[i] = server_data
-                break
-    
+        # 同步名称索引：可能是换了名字的已有条目，
+        # 也可能是临时配置这类首次落库的新条目
+        old = self._by_id.get(server_data['id'])
+        if old is not None and old['name'] != server_data['name']:
+            self._names.discard(old['name'])
+        self._by_id[server_data['id']] = server_data
+        self._names.add(server_data['name'])
+        self._sorted_cache = None
+        self._dirty = True
+
     def add_server(self, server_data):
-        """添加服务器"""
-        import uuid
+        """添加服务器，重名时抛出 ValueError"""
+        if server_data['name'] in self._names:
+            raise ValueError("服务器名称已存在")
         if 'id' not in server_data:
-            server_data['id'] = str(uuid.uuid4())
-        self.servers.append(server_data)
+            server_data['id'] = uuid.uuid4().hex
+        self._by_id[server_data['id']] = server_data
+        self._names.add(server_data['name'])
+        self._sorted_cache = None
+        self._dirty = True
         self.current_server_id = server_data['id']
-    
+
+    def rename_server(self, server_id, new_name):
+        """重命名服务器，重名时抛出 ValueError"""
+        server = self._by_id.get(server_id)
+        if server is None or new_name == server['name']:
+            return
+        if new_name in self._names:
+            raise ValueError("服务器名称已存在")
+        self._names.discard(server['name'])
+        server['name'] = new_name
+        self._names.add(new_name)
+        self._sorted_cache = None
+        self._dirty = True
+
     def delete_server(self, server_id):
         """删除服务器"""
-        self.servers = [s for s in self.servers if s['id'] != server_id]
+        server = self._by_id.pop(server_id, None)
+        if server is not None:
+            self._names.discard(server['name'])
+        self._sorted_cache = None
+        self._dirty = True
         if self.current_server_id == server_id:
-            self.current_server_id = self.servers[0]['id'] if self.servers else None
+            self.current_server_id = next(iter(self._by_id), None)
 
 
 class ProcessThread(QThread):
@@ -214,11 +396,36 @@ class ProcessThread(QThread):
         self.config = config
         self.process = None
         self.is_running = False
-    
+        # 在启动前就解析可执行文件并拼好 argv，run() 里只剩 Popen
+        self.exe_path = _find_executable(_APP_DIR, os.getcwd())
+        if self.exe_path is None:
+            # 只缓存成功的查找：失败提示会让用户把可执行文件
+            # 放到指定目录后重试，不能把"找不到"也记死
+            _find_executable.cache_clear()
+        self._cmd = self._build_cmd() if self.exe_path else None
+
+    def _build_cmd(self):
+        """根据配置拼接命令行参数"""
+        cmd = [self.exe_path]
+        for flag, key in (('-f', 'server'), ('-l', 'listen'),
+                          ('-token', 'token'), ('-ip', 'ip')):
+            value = self.config.get(key)
+            if value:
+                cmd.extend([flag, value])
+        # DOH / ECH 只在偏离默认值时传递
+        if self.config.get('dns') and self.config['dns'] != 'dns.alidns.com/dns-query':
+            cmd.extend(['-dns', self.config['dns']])
+        if self.config.get('ech') and self.config['ech'] != 'cloudflare-ech.com':
+            cmd.extend(['-ech', self.config['ech']])
+        # 添加分流模式参数
+        routing_mode = self.config.get('routing_mode', 'bypass_cn')
+        if routing_mode:
+            cmd.extend(['-routing', routing_mode])
+        return cmd
+
     def run(self):
         """运行进程"""
-        exe_path = self._find_executable()
-        if not exe_path:
+        if not self._cmd:
             app_dir = get_app_dir()
             self.log_output.emit("错误: 找不到 ech-workers 可执行文件!\n")
             self.log_output.emit(f"请确保 ech-workers 可执行文件在以下位置之一:\n")
@@ -229,59 +436,32 @@ class ProcessThread(QThread):
             self.log_output.emit(f"\n注意: ech-workers 必须是编译后的可执行文件，不是源文件。\n")
             self.process_finished.emit()
             return
-        
-        cmd = [exe_path]
-        if self.config.get('server'):
-            cmd.extend(['-f', self.config['server']])
-        if self.config.get('listen'):
-            cmd.extend(['-l', self.config['listen']])
-        if self.config.get('token'):
-            cmd.extend(['-token', self.config['token']])
-        if self.config.get('ip'):
-            cmd.extend(['-ip', self.config['ip']])
-        if self.config.get('dns') and self.config['dns'] != 'dns.alidns.com/dns-query':
-            cmd.extend(['-dns', self.config['dns']])
-        if self.config.get('ech') and self.config['ech'] != 'cloudflare-ech.com':
-            cmd.extend(['-ech', self.config['ech']])
-        # 添加分流模式参数
-        routing_mode = self.config.get('routing_mode', 'bypass_cn')
-        if routing_mode:
-            cmd.extend(['-routing', routing_mode])
-        
+
         try:
             # Windows 上需要指定 UTF-8 编码，因为 Go 程序输出 UTF-8
             # 同时隐藏子进程的控制台窗口
             popen_kwargs = {
                 'stdout': subprocess.PIPE,
                 'stderr': subprocess.STDOUT,
-                'bufsize': 1
+                'bufsize': -1
             }
-            
+
             # Windows: 使用 CREATE_NO_WINDOW 隐藏控制台
             if sys.platform == 'win32':
                 CREATE_NO_WINDOW = 0x08000000
                 popen_kwargs['creationflags'] = CREATE_NO_WINDOW
-            
-            self.process = subprocess.Popen(cmd, **popen_kwargs)
+            else:
+                # close_fds=False 且不传 preexec_fn 时 CPython 可走
+                # posix_spawn 快路径，省掉子进程里逐个关闭 FD 的循环
+                # （RLIMIT_NOFILE 很高时这个循环开销可观）；
+                # 本进程除标准管道外没有需要保护的敏感 FD。
+                # 注意不要再加 start_new_session 之类的选项：
+                # 3.13 之前它们会把 Popen 踢回 fork+exec 慢路径
+                popen_kwargs['close_fds'] = False
+
+            self.process = subprocess.Popen(self._cmd, **popen_kwargs)
             self.is_running = True
-            
-            # 使用 UTF-8 解码，忽略无法解码的字符
-            while self.is_running:
-                line = self.process.stdout.readline()
-                if not line:
-                    break
-                try:
-                    # 尝试 UTF-8 解码
-                    decoded_line = line.decode('utf-8', errors='replace')
-                except:
-                    # 如果失败，尝试系统默认编码
-                    try:
-                        decoded_line = line.decode(errors='replace')
-                    except:
-                        decoded_line = str(line)
-                if decoded_line:
-                    self.log_output.emit(decoded_line)
-            
+            self._drain_output()
             self.process.wait()
             self.is_running = False
             self.process_finished.emit()
@@ -289,6 +469,49 @@ class ProcessThread(QThread):
             self.log_output.emit(f"错误: 启动失败 - {str(e)}\n")
             self.process_finished.emit()
     
+    def _emit_lines(self, buffer):
+        """emit 缓冲区里所有完整行，返回剩余的不完整行"""
+        if b'\n' not in buffer:
+            return buffer
+        lines, _, rest = buffer.rpartition(b'\n')
+        # 使用 UTF-8 解码，忽略无法解码的字符
+        self.log_output.emit((lines + b'\n').decode('utf-8', errors='replace'))
+        return rest
+
+    def _drain_output(self):
+        """读取子进程输出，按块切行并批量 emit"""
+        buffer = b''
+        if sys.platform == 'win32':
+            # Windows 的 select 不支持管道，保持阻塞式分块读取
+            while self.is_running:
+                chunk = self.process.stdout.read1(16384)
+                if not chunk:
+                    break
+                buffer = self._emit_lines(buffer + chunk)
+        else:
+            # 非阻塞 fd + selector：没有输出时最多等 0.1s 就能
+            # 重新检查 is_running，stop() 后下一轮立即退出，
+            # 不必卡在阻塞的 read 上等子进程被 kill
+            fd = self.process.stdout.fileno()
+            os.set_blocking(fd, False)
+            with selectors.DefaultSelector() as sel:
+                sel.register(fd, selectors.EVENT_READ)
+                while self.is_running:
+                    if not sel.select(timeout=0.1):
+                        continue
+                    try:
+                        chunk = os.read(fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        break
+                    if not chunk:
+                        break
+                    buffer = self._emit_lines(buffer + chunk)
+        # 冲刷残留的不完整行
+        if buffer:
+            self.log_output.emit(buffer.decode('utf-8', errors='replace'))
+
     def stop(self):
         """停止进程"""
         self.is_running = False
@@ -298,78 +521,6 @@ class ProcessThread(QThread):
                 self.process.wait(timeout=3)
             except:
                 self.process.kill()
-    
-    def _find_executable(self):
-        """查找可执行文件（跨平台）"""
-        # 程序所在目录（支持双击运行）
-        app_dir = get_app_dir()
-        # 当前工作目录
-        current_dir = Path.cwd()
-        
-        # Windows 和 Unix 的可执行文件扩展名
-        exe_ext = '.exe' if sys.platform == 'win32' else ''
-        
-        # 可能的可执行文件路径（按优先级）
-        possible_paths = [
-            app_dir / f'ech-workers{exe_ext}',
-            current_dir / f'ech-workers{exe_ext}',
-            # Windows 特定路径
-            app_dir / 'ech-workers.exe' if sys.platform == 'win32' else None,
-            current_dir / 'ech-workers.exe' if sys.platform == 'win32' else None,
-            # Unix 路径（无扩展名）
-            app_dir / 'ech-workers' if sys.platform != 'win32' else None,
-            current_dir / 'ech-workers' if sys.platform != 'win32' else None,
-        ]
-        
-        # 过滤掉 None 值
-        possible_paths = [p for p in possible_paths if p is not None]
-        
-        for path in possible_paths:
-            if path.exists():
-                # Windows: 检查文件是否存在即可（.exe 文件）
-                # Unix: 检查文件权限
-                if sys.platform == 'win32':
-                    # Windows 上，.exe 文件可以直接运行
-                    if path.suffix.lower() == '.exe':
-                        return str(path)
-                    # 或者检查文件是否可执行
-                    try:
-                        with open(path, 'rb') as f:
-                            header = f.read(2)
-                            # PE 文件头
-                            if header == b'MZ':
-                                return str(path)
-                    except:
-                        pass
-                else:
-                    # Unix/Linux/macOS: 检查执行权限
-                    if os.access(path, os.X_OK):
-                        return str(path)
-                    # 或者检查是否是二进制文件
-                    try:
-                        with open(path, 'rb') as f:
-                            header = f.read(4)
-                            # ELF 或 Mach-O
-                            if (header.startswith(b'\x7fELF') or 
-                                header.startswith(b'\xfe\xed\xfa') or
-                                header.startswith(b'#!')):
-                                # 尝试添加执行权限
-                                try:
-                                    os.chmod(path, 0o755)
-                                except:
-                                    pass
-                                return str(path)
-                    except:
-                        pass
-        
-        # 尝试从 PATH 中查找
-        import shutil
-        exe = shutil.which('ech-workers')
-        if exe:
-            return exe
-        
-        # 如果都找不到，返回 None
-        return None
 
 
 class MainWindow(QMainWindow):
@@ -383,19 +534,36 @@ class MainWindow(QMainWindow):
         self.is_autostart = '-autostart' in sys.argv
         self.china_ip_ranges = None  # 缓存中国IP列表
         self.tray_icon = None  # 系统托盘图标
-        
+
+        # 日志批量刷新：先入队，50ms 后一次性写入文本框，
+        # 避免子进程高频输出时每行都触发一次文档重排
+        self._pending_logs = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+
         self.init_ui()
         self.init_server_combo()  # 初始化下拉框
         self.load_server_config()
-        self.init_tray_icon()  # 初始化系统托盘
-        
-        # 异步加载中国IP列表（静默模式：失败时不显示错误）
-        self.load_china_ip_list_async(silent=True)
-        
+
         if self.is_autostart:
+            # 开机自启动路径：先把代理子进程启动起来，
+            # 托盘图标绘制、IP列表加载等剩余初始化推迟到
+            # 事件循环空闲时再做，缩短到 Popen 的路径
             self.hide()
             QApplication.processEvents()
             self.auto_start()
+            QTimer.singleShot(0, self._finish_startup)
+        else:
+            self._finish_startup()
+
+    def _finish_startup(self):
+        """与启动代理无关的剩余初始化（托盘图标、IP列表）"""
+        self.init_tray_icon()  # 初始化系统托盘
+
+        # 异步加载中国IP列表（静默模式：失败时不显示错误）
+        self.load_china_ip_list_async(silent=True)
     
     def init_ui(self):
         """初始化界面"""
@@ -496,38 +664,37 @@ class MainWindow(QMainWindow):
         layout.addWidget(server_group)
         
         # 核心配置
+        # QFormLayout 直接渲染 标签/输入框 行，
+        # 不需要每行再包一个 QWidget + QHBoxLayout
         core_group = QGroupBox("核心配置")
-        core_layout = QVBoxLayout()
+        core_layout = QFormLayout()
         core_layout.setSpacing(12)
         self.server_edit = QLineEdit()
         self.server_edit.setPlaceholderText("例如: your-worker.workers.dev:443")
-        core_layout.addWidget(self.create_label_edit("服务地址:", self.server_edit))
+        core_layout.addRow("服务地址:", self.server_edit)
         self.listen_edit = QLineEdit()
         self.listen_edit.setPlaceholderText("例如: 127.0.0.1:30000")
-        core_layout.addWidget(self.create_label_edit("监听地址:", self.listen_edit))
+        core_layout.addRow("监听地址:", self.listen_edit)
         core_group.setLayout(core_layout)
         layout.addWidget(core_group)
         
         # 高级选项
         advanced_group = QGroupBox("高级选项 (可选)")
-        advanced_layout = QVBoxLayout()
+        advanced_layout = QFormLayout()
         advanced_layout.setSpacing(12)
         self.token_edit = QLineEdit()
         self.token_edit.setPlaceholderText("身份验证令牌（可选）")
         self.token_edit.setEchoMode(QLineEdit.Password)
-        advanced_layout.addWidget(self.create_label_edit("身份令牌:", self.token_edit))
-        row1 = QHBoxLayout()
-        row1.setSpacing(10)
+        advanced_layout.addRow("身份令牌:", self.token_edit)
         self.ip_edit = QLineEdit()
         self.ip_edit.setPlaceholderText("例如: saas.sin.fan")
-        row1.addWidget(self.create_label_edit("优选IP或域名:", self.ip_edit))
+        advanced_layout.addRow("优选IP或域名:", self.ip_edit)
         self.dns_edit = QLineEdit()
         self.dns_edit.setPlaceholderText("例如: dns.alidns.com/dns-query")
-        row1.addWidget(self.create_label_edit("DOH服务器:", self.dns_edit))
-        advanced_layout.addLayout(row1)
+        advanced_layout.addRow("DOH服务器:", self.dns_edit)
         self.ech_edit = QLineEdit()
         self.ech_edit.setPlaceholderText("例如: cloudflare-ech.com")
-        advanced_layout.addWidget(self.create_label_edit("ECH域名:", self.ech_edit))
+        advanced_layout.addRow("ECH域名:", self.ech_edit)
         advanced_group.setLayout(advanced_layout)
         layout.addWidget(advanced_group)
         
@@ -579,10 +746,13 @@ class MainWindow(QMainWindow):
         # 日志
         log_group = QGroupBox("运行日志")
         log_layout = QVBoxLayout()
-        self.log_text = QTextEdit()
+        # QPlainTextEdit 专为追加式日志设计：没有富文本排版引擎，
+        # 逐行追加的开销远低于 QTextEdit
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        # 超过 1000 行时由 Qt 在插入时自动淘汰最旧的块
+        self.log_text.setMaximumBlockCount(1000)
         # 使用等宽字体，更适合日志显示
-        from PyQt5.QtGui import QFont
         font = QFont("Consolas" if sys.platform == 'win32' else "Monaco" if sys.platform == 'darwin' else "DejaVu Sans Mono", 9)
         self.log_text.setFont(font)
         log_layout.addWidget(self.log_text)
@@ -850,7 +1020,7 @@ class MainWindow(QMainWindow):
         }
         
         /* 文本编辑框样式（日志） - 矩阵风格 */
-        QTextEdit {
+        QPlainTextEdit {
             border: 2px solid #00ff41;
             border-radius: 6px;
             padding: 12px;
@@ -861,7 +1031,7 @@ class MainWindow(QMainWindow):
             selection-color: #000000;
         }
         
-        QTextEdit:focus {
+        QPlainTextEdit:focus {
             border: 2px solid #00ff41;
         }
         
@@ -1030,8 +1200,8 @@ class MainWindow(QMainWindow):
         """从程序目录读取并解析中国IP列表（离线版本）"""
         try:
             # 尝试从缓存读取（永久有效，不检查过期时间）
-            cache_file = self.config_manager.config_dir / "china_ip_list.json"
-            if cache_file.exists():
+            cache_file = os.path.join(self.config_manager.config_dir, "china_ip_list.json")
+            if os.path.exists(cache_file):
                 try:
                     with open(cache_file, 'r', encoding='utf-8') as f:
                         cached_data = json.load(f)
@@ -1151,42 +1321,22 @@ class MainWindow(QMainWindow):
         
         return sorted(list(optimized))
     
-    def create_label_edit(self, label_text, edit_widget):
-        """创建标签和输入框"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
-        label = QLabel(label_text)
-        label.setMinimumWidth(120)
-        label.setStyleSheet("font-weight: 500;")
-        layout.addWidget(label)
-        layout.addWidget(edit_widget, 1)
-        return widget
-    
     def init_server_combo(self):
         """初始化服务器下拉框（首次加载）"""
-        # 暂时断开信号，避免触发 on_server_changed
-        try:
-            self.server_combo.currentIndexChanged.disconnect()
-        except:
-            pass
-        
-        self.server_combo.clear()
-        sorted_servers = sorted(self.config_manager.servers, key=lambda x: x['name'])
-        for server in sorted_servers:
-            self.server_combo.addItem(server['name'], server['id'])
-        
-        # 选中当前服务器
-        current = self.config_manager.get_current_server()
-        if current:
-            for i in range(self.server_combo.count()):
-                if self.server_combo.itemData(i) == current['id']:
-                    self.server_combo.setCurrentIndex(i)
-                    break
-        
-        # 重新连接信号
-        self.server_combo.currentIndexChanged.connect(self.on_server_changed)
+        # 屏蔽信号，避免触发 on_server_changed
+        with QSignalBlocker(self.server_combo):
+            self.server_combo.clear()
+            sorted_servers = self.config_manager.sorted_servers()
+            for server in sorted_servers:
+                self.server_combo.addItem(server['name'], server['id'])
+
+            # 选中当前服务器
+            current = self.config_manager.get_current_server()
+            if current:
+                for i in range(self.server_combo.count()):
+                    if self.server_combo.itemData(i) == current['id']:
+                        self.server_combo.setCurrentIndex(i)
+                        break
     
     def load_server_config(self):
         """加载服务器配置"""
@@ -1208,64 +1358,55 @@ class MainWindow(QMainWindow):
     
     def refresh_server_combo(self):
         """刷新服务器下拉框"""
-        # 暂时断开信号连接，避免递归
-        try:
-            self.server_combo.currentIndexChanged.disconnect()
-        except:
-            pass
-        
-        self.server_combo.clear()
-        
-        # 确保有服务器
-        if not self.config_manager.servers:
-            # 如果没有服务器，添加默认服务器
-            self.config_manager.add_default_server()
-        
-        sorted_servers = sorted(self.config_manager.servers, key=lambda x: x['name'])
-        for server in sorted_servers:
-            self.server_combo.addItem(server['name'], server['id'])
-        
-        # 确保有当前服务器
-        current = self.config_manager.get_current_server()
-        if current:
-            # 查找并选中当前服务器
-            found = False
-            for i in range(self.server_combo.count()):
-                if self.server_combo.itemData(i) == current['id']:
-                    self.server_combo.setCurrentIndex(i)
-                    found = True
-                    break
-            
-            # 如果找不到当前服务器，选中第一个
-            if not found and self.server_combo.count() > 0:
-                self.server_combo.setCurrentIndex(0)
-                # 更新当前服务器ID
-                if self.server_combo.itemData(0):
-                    self.config_manager.current_server_id = self.server_combo.itemData(0)
-        else:
-            # 如果没有当前服务器，选中第一个
-            if self.server_combo.count() > 0:
-                self.server_combo.setCurrentIndex(0)
-                # 更新当前服务器ID
-                if self.server_combo.itemData(0):
-                    self.config_manager.current_server_id = self.server_combo.itemData(0)
-        
-        # 重新连接信号
-        self.server_combo.currentIndexChanged.connect(self.on_server_changed)
+        # 屏蔽信号，避免递归触发 on_server_changed
+        with QSignalBlocker(self.server_combo):
+            self.server_combo.clear()
+
+            # 确保有服务器
+            if not self.config_manager.servers:
+                # 如果没有服务器，添加默认服务器
+                self.config_manager.add_default_server()
+
+            sorted_servers = self.config_manager.sorted_servers()
+            for server in sorted_servers:
+                self.server_combo.addItem(server['name'], server['id'])
+
+            # 确保有当前服务器
+            current = self.config_manager.get_current_server()
+            if current:
+                # 查找并选中当前服务器
+                found = False
+                for i in range(self.server_combo.count()):
+                    if self.server_combo.itemData(i) == current['id']:
+                        self.server_combo.setCurrentIndex(i)
+                        found = True
+                        break
+
+                # 如果找不到当前服务器，选中第一个
+                if not found and self.server_combo.count() > 0:
+                    self.server_combo.setCurrentIndex(0)
+                    # 更新当前服务器ID
+                    if self.server_combo.itemData(0):
+                        self.config_manager.current_server_id = self.server_combo.itemData(0)
+            else:
+                # 如果没有当前服务器，选中第一个
+                if self.server_combo.count() > 0:
+                    self.server_combo.setCurrentIndex(0)
+                    # 更新当前服务器ID
+                    if self.server_combo.itemData(0):
+                        self.config_manager.current_server_id = self.server_combo.itemData(0)
     
     def get_control_values(self):
         """获取界面输入值"""
         server = self.config_manager.get_current_server()
         if not server:
             # 如果没有当前服务器，创建一个临时配置
-            import uuid
             server = {
-                'id': str(uuid.uuid4()),
+                'id': uuid.uuid4().hex,
                 'name': '临时配置',
             }
         
-        # 创建副本并更新为界面当前值
-        server = server.copy()
+        # 直接写回存储的配置字典（不再复制一份），并标记待保存
         server['server'] = self.server_edit.text()
         server['listen'] = self.listen_edit.text()
         server['token'] = self.token_edit.text()
@@ -1280,21 +1421,21 @@ class MainWindow(QMainWindow):
         else:
             # 如果没有选择，使用默认值
             server['routing_mode'] = server.get('routing_mode', 'bypass_cn')
-        
+
+        self.config_manager.mark_dirty()
         return server
     
     def on_server_changed(self):
         """服务器选择改变"""
         if self.process_thread and self.process_thread.is_running:
-            # 暂时断开信号，恢复选择
-            self.server_combo.currentIndexChanged.disconnect()
-            current = self.config_manager.get_current_server()
-            if current:
-                for i in range(self.server_combo.count()):
-                    if self.server_combo.itemData(i) == current['id']:
-                        self.server_combo.setCurrentIndex(i)
-                        break
-            self.server_combo.currentIndexChanged.connect(self.on_server_changed)
+            # 屏蔽信号并恢复原来的选择
+            with QSignalBlocker(self.server_combo):
+                current = self.config_manager.get_current_server()
+                if current:
+                    for i in range(self.server_combo.count()):
+                        if self.server_combo.itemData(i) == current['id']:
+                            self.server_combo.setCurrentIndex(i)
+                            break
             QMessageBox.warning(self, "提示", "请先停止当前连接后再切换服务器")
             return
         
@@ -1320,11 +1461,11 @@ class MainWindow(QMainWindow):
                 
                 # 切换到新服务器
                 self.config_manager.current_server_id = server_id
-                # 暂时断开信号，避免递归
-                self.server_combo.currentIndexChanged.disconnect()
-                # 加载新服务器的配置到界面
-                self.load_server_config()
-                self.server_combo.currentIndexChanged.connect(self.on_server_changed)
+                self.config_manager.mark_dirty()
+                # 屏蔽信号，避免递归
+                with QSignalBlocker(self.server_combo):
+                    # 加载新服务器的配置到界面
+                    self.load_server_config()
                 # 保存配置
                 self.config_manager.save_config()
     
@@ -1333,10 +1474,6 @@ class MainWindow(QMainWindow):
         name, ok = QInputDialog.getText(self, "新增服务器", "请输入服务器名称:", text="新服务器")
         if ok and name.strip():
             name = name.strip()
-            if any(s['name'] == name for s in self.config_manager.servers):
-                QMessageBox.warning(self, "提示", "服务器名称已存在")
-                return
-            
             # 获取当前界面输入的值作为新服务器的默认值
             current = self.get_control_values()
             # 创建新服务器，只复制配置值，不复制 id 和 name
@@ -1350,8 +1487,12 @@ class MainWindow(QMainWindow):
                 'routing_mode': current.get('routing_mode', 'bypass_cn') if current else 'bypass_cn',
                 'name': name
             }
-            # 添加服务器（会自动生成新的 id）
-            self.config_manager.add_server(new_server)
+            # 添加服务器（会自动生成新的 id，重名时抛出 ValueError）
+            try:
+                self.config_manager.add_server(new_server)
+            except ValueError:
+                QMessageBox.warning(self, "提示", "服务器名称已存在")
+                return
             self.config_manager.save_config()
             self.refresh_server_combo()
             # 切换到新添加的服务器
@@ -1403,13 +1544,12 @@ class MainWindow(QMainWindow):
             new_name, ok = QInputDialog.getText(self, "重命名服务器", "请输入新的服务器名称:", text=server['name'])
             if ok and new_name.strip():
                 new_name = new_name.strip()
-                if any(s['name'] == new_name and s['id'] != server['id'] for s in self.config_manager.servers):
+                old_name = server['name']
+                try:
+                    self.config_manager.rename_server(server['id'], new_name)
+                except ValueError:
                     QMessageBox.warning(self, "提示", "服务器名称已存在")
                     return
-                
-                old_name = server['name']
-                server['name'] = new_name
-                self.config_manager.update_server(server)
                 self.config_manager.save_config()
                 self.refresh_server_combo()
                 self.append_log(f"[系统] 服务器已重命名: {old_name} -> {new_name}\n")
@@ -1619,29 +1759,19 @@ class MainWindow(QMainWindow):
         self.log_text.clear()
     
     def append_log(self, text):
-        """追加日志"""
-        self.log_text.append(text)
-        # 限制日志长度（使用更安全的方式，避免 QTextCursor 信号问题）
-        if self.log_text.document().blockCount() > 1000:
-            try:
-                # 获取文档内容
-                doc = self.log_text.document()
-                # 删除前100行
-                cursor = QTextCursor(doc)
-                cursor.movePosition(QTextCursor.Start)
-                for _ in range(100):
-                    cursor.movePosition(QTextCursor.Down, QTextCursor.MoveAnchor)
-                cursor.movePosition(QTextCursor.Start, QTextCursor.KeepAnchor)
-                cursor.removeSelectedText()
-            except:
-                # 如果出错，直接清空并保留最后900行
-                try:
-                    content = self.log_text.toPlainText()
-                    lines = content.split('\n')
-                    if len(lines) > 900:
-                        self.log_text.setPlainText('\n'.join(lines[-900:]))
-                except:
-                    pass
+        """追加日志（入队，由定时器批量刷新）"""
+        self._pending_logs.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """把队列中的日志一次性写入文本框"""
+        if not self._pending_logs:
+            return
+        text = ''.join(self._pending_logs)
+        self._pending_logs.clear()
+        self.log_text.moveCursor(QTextCursor.End)
+        self.log_text.insertPlainText(text)
     
     def update_auto_start_checkbox(self):
         """更新开机启动复选框状态"""